@@ -19,6 +19,7 @@ import platform
 import shutil
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -128,9 +129,13 @@ def detect_existing_setup(claude_dir: Path) -> ExistingSetup:
     return setup
 
 
+@lru_cache(maxsize=1)
 def get_opc_integration_source() -> Path:
     """Get path to .claude directory to install from.
 
+    The result never changes within a process (it is derived from this
+    file's location), so it is computed once and memoized.
+
     Returns:
         Path to the project root .claude source directory
     """
@@ -249,9 +254,13 @@ def backup_claude_dir(claude_dir: Path) -> Path | None:
     return backup_path
 
 
+@lru_cache(maxsize=1)
 def get_global_claude_dir() -> Path:
     """Get the global ~/.claude directory path.
 
+    Cached - Path.home() can hit a passwd lookup and callers ask for this
+    from several steps.
+
     Returns:
         Path to global .claude directory (may not exist)
     """
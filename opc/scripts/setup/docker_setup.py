@@ -55,12 +55,18 @@ def get_container_runtime() -> str:
 async def start_docker_stack(
     compose_file: Path | None = None,
     env_file: Path | None = None,
+    wait: bool = False,
+    wait_timeout: int = 60,
 ) -> dict[str, Any]:
     """Start the Docker Compose stack.
 
     Args:
         compose_file: Path to docker-compose.yml (defaults to project root)
         env_file: Path to .env file for variable substitution
+        wait: Pass --wait so compose itself blocks until services are
+            healthy (one process, no polling). Docker-only - podman
+            compose does not support the flag.
+        wait_timeout: Seconds for --wait-timeout when wait is True
 
     Returns:
         dict with keys: success, error (if failed), output
@@ -75,6 +81,8 @@ async def start_docker_stack(
     if env_file and env_file.exists():
         cmd.extend(["--env-file", str(env_file)])
     cmd.extend(["up", "-d"])
+    if wait:
+        cmd.extend(["--wait", "--wait-timeout", str(wait_timeout)])
 
     try:
         process = await asyncio.create_subprocess_exec(
@@ -92,62 +100,88 @@ async def start_docker_stack(
         return {"success": False, "error": str(e)}
 
 
-async def wait_for_services(
-    timeout: int = 60,
+async def probe_services_once(
     services: list[str] | None = None,
     compose_file: Path | None = None,
 ) -> dict[str, Any]:
-    """Wait for Docker services to become healthy.
+    """Probe service health once without waiting.
 
     Args:
-        timeout: Maximum seconds to wait
-        services: List of service names to check (defaults to postgres, redis)
+        services: List of service names to check (defaults to postgres)
         compose_file: Path to docker-compose.yml
 
     Returns:
-        dict with service health status and all_healthy flag
+        dict with per-service health booleans, an all_healthy flag, and
+        an any_running flag (true when at least one container reported a
+        health state at all - i.e. the stack came up, healthy or not)
     """
     services = services or ["postgres"]
     compose_path = compose_file or DOCKER_COMPOSE_FILE
     result = {s: False for s in services}
     result["all_healthy"] = False
+    result["any_running"] = False
 
-    start_time = asyncio.get_event_loop().time()
+    for service in services:
+        try:
+            process = await asyncio.create_subprocess_exec(
+                _CONTAINER_RUNTIME,
+                "compose",
+                "-f",
+                str(compose_path),
+                "ps",
+                service,
+                "--format",
+                "{{.Health}}",
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            stdout, _ = await process.communicate()
+
+            health = stdout.decode().strip().lower()
+            if health:
+                # "starting"/"unhealthy" still means the container exists
+                result["any_running"] = True
+            if health == "healthy" or process.returncode == 0 and "healthy" in health:
+                result[service] = True
+        except Exception:
+            pass
+
+    result["all_healthy"] = all(result[s] for s in services)
+    return result
 
-    while (asyncio.get_event_loop().time() - start_time) < timeout:
-        all_healthy = True
 
-        for service in services:
-            try:
-                process = await asyncio.create_subprocess_exec(
-                    _CONTAINER_RUNTIME,
-                    "compose",
-                    "-f",
-                    str(compose_path),
-                    "ps",
-                    service,
-                    "--format",
-                    "{{.Health}}",
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                )
-                stdout, _ = await process.communicate()
+async def wait_for_services(
+    timeout: int = 60,
+    services: list[str] | None = None,
+    compose_file: Path | None = None,
+) -> dict[str, Any]:
+    """Wait for Docker services to become healthy.
 
-                health = stdout.decode().strip().lower()
-                if health == "healthy" or process.returncode == 0 and "healthy" in health:
-                    result[service] = True
-                else:
-                    pass
-            except Exception:
-                pass
+    Polls with exponential backoff (100ms doubling up to 2s) so services
+    that come up quickly are detected within ~100ms instead of waiting
+    out a fixed one-second interval.
 
-        if all(result[s] for s in services):
-            result["all_healthy"] = True
-            return result
+    Args:
+        timeout: Maximum seconds to wait
+        services: List of service names to check (defaults to postgres, redis)
+        compose_file: Path to docker-compose.yml
+
+    Returns:
+        dict with service health status and all_healthy flag
+    """
+    services = services or ["postgres"]
 
-        await asyncio.sleep(1)
+    delay = 0.1
+    deadline = asyncio.get_event_loop().time() + timeout
 
-    return result
+    while True:
+        result = await probe_services_once(services=services, compose_file=compose_file)
+        if result["all_healthy"]:
+            return result
+        if asyncio.get_event_loop().time() >= deadline:
+            return result
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 2.0)
 
 
 async def run_migrations(